@@ -5,136 +5,220 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
+from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional
+import copy
 import os
 from pathlib import Path
 import re
 
-app = FastAPI(title="Mergington High School API",
-              description="API for viewing and signing up for extracurricular activities")
+router = APIRouter()
+
+# Landing page the root URL redirects to
+STATIC_INDEX = "/static/index.html"
 
 # Email validation pattern - only accepts @mergington.edu domain
-EMAIL_PATTERN = r"^[a-zA-Z0-9._%+\-]+@mergington\.edu$"
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+\-]+@mergington\.edu$")
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
     if not email or not isinstance(email, str):
         return False
-    return bool(re.match(EMAIL_PATTERN, email.strip()))
-
-# Mount the static files directory
-current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
+    return bool(EMAIL_PATTERN.match(email.strip()))
 
-# In-memory activity database
-activities = {
+# Seed data for the in-memory activity database (participants are kept as
+# sets for O(1) lookups)
+INITIAL_ACTIVITIES = {
     "Basketball": {
         "description": "Team basketball games and practice sessions",
         "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
         "max_participants": 15,
-        "participants": ["alex@mergington.edu"]
+        "participants": {"alex@mergington.edu"}
         },
         "Tennis Club": {
         "description": "Tennis lessons and friendly matches",
         "schedule": "Saturdays, 10:00 AM - 12:00 PM",
         "max_participants": 10,
-        "participants": ["james@mergington.edu"]
+        "participants": {"james@mergington.edu"}
         },
         "Debate Team": {
         "description": "Develop critical thinking and public speaking skills",
         "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
         "max_participants": 16,
-        "participants": ["sarah@mergington.edu"]
+        "participants": {"sarah@mergington.edu"}
         },
         "Math Olympiad": {
         "description": "Prepare for advanced mathematics competitions",
         "schedule": "Thursdays, 4:00 PM - 5:30 PM",
         "max_participants": 14,
-        "participants": ["alex@mergington.edu", "marcus@mergington.edu"]
+        "participants": {"alex@mergington.edu", "marcus@mergington.edu"}
         },
         "Drama Club": {
         "description": "Stage performances and theatrical productions",
         "schedule": "Tuesdays and Fridays, 4:00 PM - 5:30 PM",
         "max_participants": 20,
-        "participants": ["isabella@mergington.edu"]
+        "participants": {"isabella@mergington.edu"}
         },
         "Art Studio": {
         "description": "Painting, drawing, and sculpture classes",
         "schedule": "Mondays, Wednesdays, Fridays, 3:30 PM - 4:30 PM",
         "max_participants": 18,
-        "participants": ["grace@mergington.edu", "ryan@mergington.edu"]
+        "participants": {"grace@mergington.edu", "ryan@mergington.edu"}
         },
     "Chess Club": {
         "description": "Learn strategies and compete in chess tournaments",
         "schedule": "Fridays, 3:30 PM - 5:00 PM",
         "max_participants": 12,
-        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+        "participants": {"michael@mergington.edu", "daniel@mergington.edu"}
     },
     "Programming Class": {
         "description": "Learn programming fundamentals and build software projects",
         "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
         "max_participants": 20,
-        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+        "participants": {"emma@mergington.edu", "sophia@mergington.edu"}
     },
     "Gym Class": {
         "description": "Physical education and sports activities",
         "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
         "max_participants": 30,
-        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+        "participants": {"john@mergington.edu", "olivia@mergington.edu"}
     }
 }
 
+# In-memory activity database
+activities = copy.deepcopy(INITIAL_ACTIVITIES)
+
+
+# Response models - declaring them lets FastAPI serialize responses straight
+# to JSON bytes via Pydantic
+class Activity(BaseModel):
+    description: str
+    schedule: str
+    max_participants: int
+    participants: List[str]
+
+
+class Participants(BaseModel):
+    participants: List[str]
+    count: int
+
+
+class Message(BaseModel):
+    message: str
+
 
-@app.get("/")
+@router.get("/")
 def root():
-    return RedirectResponse(url="/static/index.html")
+    return RedirectResponse(url=STATIC_INDEX, status_code=307)
 
 
-@app.get("/activities")
+def serialize_activity(activity: dict) -> dict:
+    """Return a JSON-ready copy of an activity with participants sorted"""
+    return {**activity, "participants": sorted(activity["participants"])}
+
+
+@router.get("/activities", response_model=Dict[str, Activity])
 def get_activities():
-    return activities
+    return {name: serialize_activity(activity) for name, activity in activities.items()}
 
 
-@app.post("/activities/{activity_name}/signup")
+@router.get("/activities/{activity_name}/participants", response_model=Participants)
+def get_participants(activity_name: str):
+    """Get the participants of a single activity"""
+    # Validate activity exists
+    if activity_name not in activities:
+        raise HTTPException(status_code=404, detail={"code": "ACTIVITY_NOT_FOUND", "message": "Activity not found"})
+
+    participants = activities[activity_name]["participants"]
+    return {"participants": sorted(participants), "count": len(participants)}
+
+
+class BatchOperation(BaseModel):
+    """A single operation within a batch request"""
+    op: Literal["signup", "unregister", "read"]
+    activity: Optional[str] = None
+    email: Optional[str] = None
+
+
+@router.post("/activities/batch")
+def batch_activities(operations: List[BatchOperation]):
+    """Run several signup/unregister/read operations in a single request"""
+    results = []
+    for operation in operations:
+        try:
+            if operation.op == "signup":
+                body = signup_for_activity(operation.activity, operation.email)
+            elif operation.op == "unregister":
+                body = unregister_from_activity(operation.activity, operation.email)
+            elif operation.activity is None:
+                body = get_activities()
+            else:
+                body = get_participants(operation.activity)
+            results.append({"status_code": 200, "body": body})
+        except HTTPException as exc:
+            results.append({"status_code": exc.status_code, "body": {"detail": exc.detail}})
+    return results
+
+
+@router.post("/activities/{activity_name}/signup", response_model=Message)
 def signup_for_activity(activity_name: str, email: str):
     """Sign up a student for an activity"""
     # Validate email format
     if not validate_email(email):
-        raise HTTPException(status_code=400, detail="Invalid email format")
+        raise HTTPException(status_code=400, detail={"code": "INVALID_EMAIL", "message": "Invalid email format"})
     
     # Validate activity exists
     if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        raise HTTPException(status_code=404, detail={"code": "ACTIVITY_NOT_FOUND", "message": "Activity not found"})
 
     # Get the specific activity
     activity = activities[activity_name]
 
     # Validate student is not already signed up
     if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student already signed up for this activity")
+        raise HTTPException(status_code=400, detail={"code": "ALREADY_REGISTERED", "message": "Student already signed up for this activity"})
 
     # Add student
-    activity["participants"].append(email)
+    activity["participants"].add(email)
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
-@app.post("/activities/{activity_name}/unregister")
+@router.post("/activities/{activity_name}/unregister", response_model=Message)
 def unregister_from_activity(activity_name: str, email: str):
     """Unregister a student from an activity"""
     # Validate activity exists
     if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        raise HTTPException(status_code=404, detail={"code": "ACTIVITY_NOT_FOUND", "message": "Activity not found"})
 
     # Get the specific activity
     activity = activities[activity_name]
 
     # Check if student is registered
     if email not in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student not registered for this activity")
+        raise HTTPException(status_code=400, detail={"code": "NOT_REGISTERED", "message": "Student not registered for this activity"})
 
     # Remove student
-    activity["participants"].remove(email)
+    activity["participants"].discard(email)
     return {"message": f"Removed {email} from {activity_name}"}
+
+
+def create_app(config: Optional[dict] = None) -> FastAPI:
+    """Build the FastAPI application; ``config`` overrides FastAPI settings"""
+    settings = {
+        "title": "Mergington High School API",
+        "description": "API for viewing and signing up for extracurricular activities",
+        **(config or {}),
+    }
+    application = FastAPI(**settings)
+    application.include_router(router)
+
+    # Mount the static files directory
+    application.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
+                      "static")), name="static")
+    return application
+
+
+app = create_app()
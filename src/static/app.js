@@ -66,7 +66,7 @@ document.addEventListener("DOMContentLoaded", () => {
                 setTimeout(() => { messageDiv.classList.add("hidden"); }, 5000);
                 fetchActivities();
               } else {
-                messageDiv.textContent = result.detail || "Failed to remove participant";
+                messageDiv.textContent = (result.detail && result.detail.message) || "Failed to remove participant";
                 messageDiv.className = "error";
                 messageDiv.classList.remove("hidden");
               }
@@ -108,7 +108,7 @@ document.addEventListener("DOMContentLoaded", () => {
         signupForm.reset();
         fetchActivities();
       } else {
-        messageDiv.textContent = result.detail || "An error occurred";
+        messageDiv.textContent = (result.detail && result.detail.message) || "An error occurred";
         messageDiv.className = "error";
       }
 
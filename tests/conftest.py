@@ -0,0 +1,58 @@
+"""
+Shared pytest fixtures for the FastAPI application tests
+"""
+import copy
+from functools import lru_cache
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from src import app as app_module
+from src.app import create_app
+
+
+@lru_cache(maxsize=8)
+def _make_app(config_key: tuple = ()):
+    """Build (and cache) one application per unique config"""
+    return create_app(dict(config_key))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Provide a single TestClient for the whole test session"""
+    with TestClient(_make_app()) as c:
+        yield c
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run async tests on asyncio only"""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def asgi_transport():
+    """Provide a single ASGI transport shared by every async client"""
+    return httpx.ASGITransport(app=_make_app())
+
+
+@pytest.fixture
+async def async_client(asgi_transport):
+    """Provide an httpx AsyncClient bound directly to the ASGI app"""
+    async with httpx.AsyncClient(transport=asgi_transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def unique_email():
+    """Return a factory producing a fresh @mergington.edu address per call"""
+    return lambda prefix="u": f"{prefix}-{uuid4().hex[:8]}@mergington.edu"
+
+
+@pytest.fixture(autouse=True)
+def _reset_activities():
+    """Reset the in-memory activities database to its seed data after each test"""
+    yield
+    app_module.activities.clear()
+    app_module.activities.update(copy.deepcopy(app_module.INITIAL_ACTIVITIES))
@@ -1,24 +1,48 @@
 """
 Tests for the FastAPI application endpoints
 """
+import asyncio
+
 import pytest
-from fastapi.testclient import TestClient
-from src.app import app
 
 
-client = TestClient(app)
+STATIC_INDEX = "/static/index.html"
+
+# Shared email tables, built once at import and reused by parametrized and
+# concurrent tests alike
+VALID_EMAILS = (
+    "simple@mergington.edu",
+    "user.name@mergington.edu",
+    "user_name@mergington.edu",
+    "user123@mergington.edu",
+)
+
+INVALID_DOMAIN_EMAILS = (
+    "user@example.com",
+    "user@gmail.com",
+    "user@mergington.com",
+    "user@mergington.org",
+)
+
+MALFORMED_EMAILS = (
+    "testmergington.edu",
+    "test@",
+    "test@mergington",
+    "",
+    "test user@mergington.edu",
+)
 
 
 class TestActivitiesEndpoints:
     """Test cases for activities endpoints"""
 
-    def test_root_redirect(self):
+    def test_root_redirect(self, client):
         """Test that root redirects to static/index.html"""
         response = client.get("/", follow_redirects=False)
         assert response.status_code == 307
-        assert "static/index.html" in response.headers["location"]
+        assert response.headers["location"] == STATIC_INDEX
 
-    def test_get_activities(self):
+    def test_get_activities(self, client):
         """Test getting all activities"""
         response = client.get("/activities")
         assert response.status_code == 200
@@ -37,53 +61,73 @@ class TestActivitiesEndpoints:
         assert "participants" in basketball
         assert isinstance(basketball["participants"], list)
 
-    def test_signup_for_activity_success(self):
+        # Participants are returned in a deterministic (sorted) order
+        for activity in activities.values():
+            assert activity["participants"] == sorted(activity["participants"])
+
+    def test_get_participants(self, client):
+        """Test getting the participants of a single activity"""
+        response = client.get("/activities/Chess Club/participants")
+        assert response.status_code == 200
+        assert response.json() == {
+            "participants": ["daniel@mergington.edu", "michael@mergington.edu"],
+            "count": 2
+        }
+
+    def test_get_participants_nonexistent_activity(self, client):
+        """Test getting participants fails for non-existent activity"""
+        response = client.get("/activities/Fake Activity/participants")
+        assert response.status_code == 404
+        assert response.json()["detail"]["code"] == "ACTIVITY_NOT_FOUND"
+
+    def test_signup_for_activity_success(self, client, unique_email):
         """Test successful signup for an activity"""
+        email = unique_email("test")
         response = client.post(
-            "/activities/Basketball/signup?email=test@mergington.edu"
+            "/activities/Basketball/signup", params={"email": email}
         )
         assert response.status_code == 200
         
         result = response.json()
         assert "message" in result
-        assert "test@mergington.edu" in result["message"]
+        assert email in result["message"]
         assert "Basketball" in result["message"]
 
-    def test_signup_already_registered(self):
+    def test_signup_already_registered(self, client, unique_email):
         """Test signup fails if student is already registered"""
-        email = "duplicate@mergington.edu"
+        email = unique_email("duplicate")
         
         # First signup should succeed
         response1 = client.post(
-            f"/activities/Tennis Club/signup?email={email}"
+            "/activities/Tennis Club/signup", params={"email": email}
         )
         assert response1.status_code == 200
         
         # Second signup with same email should fail
         response2 = client.post(
-            f"/activities/Tennis Club/signup?email={email}"
+            "/activities/Tennis Club/signup", params={"email": email}
         )
         assert response2.status_code == 400
-        assert "already signed up" in response2.json()["detail"]
+        assert response2.json()["detail"]["code"] == "ALREADY_REGISTERED"
 
-    def test_signup_nonexistent_activity(self):
+    def test_signup_nonexistent_activity(self, client, unique_email):
         """Test signup fails for non-existent activity"""
         response = client.post(
-            "/activities/Nonexistent Activity/signup?email=test@mergington.edu"
+            "/activities/Nonexistent Activity/signup", params={"email": unique_email("test")}
         )
         assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
+        assert response.json()["detail"]["code"] == "ACTIVITY_NOT_FOUND"
 
-    def test_unregister_success(self):
+    def test_unregister_success(self, client, unique_email):
         """Test successful unregistration from an activity"""
-        email = "unregister-test@mergington.edu"
+        email = unique_email("unregister-test")
         
         # First, sign up
-        client.post(f"/activities/Art Studio/signup?email={email}")
+        client.post("/activities/Art Studio/signup", params={"email": email})
         
         # Then unregister
         response = client.post(
-            f"/activities/Art Studio/unregister?email={email}"
+            "/activities/Art Studio/unregister", params={"email": email}
         )
         assert response.status_code == 200
         
@@ -92,124 +136,138 @@ class TestActivitiesEndpoints:
         assert email in result["message"]
         
         # Verify participant is removed
-        activities = client.get("/activities").json()
-        assert email not in activities["Art Studio"]["participants"]
+        participants = client.get("/activities/Art Studio/participants").json()
+        assert email not in participants["participants"]
 
-    def test_unregister_not_registered(self):
+    def test_unregister_not_registered(self, client, unique_email):
         """Test unregister fails if student is not registered"""
         response = client.post(
-            "/activities/Math Olympiad/unregister?email=notregistered@mergington.edu"
+            "/activities/Math Olympiad/unregister", params={"email": unique_email("notregistered")}
         )
         assert response.status_code == 400
-        assert "not registered" in response.json()["detail"]
+        assert response.json()["detail"]["code"] == "NOT_REGISTERED"
 
-    def test_unregister_nonexistent_activity(self):
+    def test_unregister_nonexistent_activity(self, client, unique_email):
         """Test unregister fails for non-existent activity"""
         response = client.post(
-            "/activities/Fake Activity/unregister?email=test@mergington.edu"
+            "/activities/Fake Activity/unregister", params={"email": unique_email("test")}
         )
         assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
+        assert response.json()["detail"]["code"] == "ACTIVITY_NOT_FOUND"
 
-    def test_participants_list_integrity(self):
+    def test_participants_list_integrity(self, client, unique_email):
         """Test that participant list is maintained correctly"""
-        # Get initial count
-        initial = client.get("/activities").json()
-        initial_count = len(initial["Drama Club"]["participants"])
-        
-        email = "integrity-test@mergington.edu"
-        
-        # Sign up
-        client.post(f"/activities/Drama Club/signup?email={email}")
-        
+        email = unique_email("integrity-test")
+
+        response = client.post("/activities/batch", json=[
+            {"op": "read", "activity": "Drama Club"},
+            {"op": "signup", "activity": "Drama Club", "email": email},
+            {"op": "read", "activity": "Drama Club"},
+            {"op": "unregister", "activity": "Drama Club", "email": email},
+            {"op": "read", "activity": "Drama Club"},
+        ])
+        assert response.status_code == 200
+
+        results = response.json()
+        assert [r["status_code"] for r in results] == [200] * 5
+        initial, _, after_signup, _, after_unregister = results
+        initial_count = initial["body"]["count"]
+
         # Check count increased
-        after_signup = client.get("/activities").json()
-        assert len(after_signup["Drama Club"]["participants"]) == initial_count + 1
-        assert email in after_signup["Drama Club"]["participants"]
-        
-        # Unregister
-        client.post(f"/activities/Drama Club/unregister?email={email}")
-        
+        assert after_signup["body"]["count"] == initial_count + 1
+        assert email in after_signup["body"]["participants"]
+
         # Check count back to original
-        after_unregister = client.get("/activities").json()
-        assert len(after_unregister["Drama Club"]["participants"]) == initial_count
-        assert email not in after_unregister["Drama Club"]["participants"]
+        assert after_unregister["body"]["count"] == initial_count
+        assert email not in after_unregister["body"]["participants"]
+
+    @pytest.mark.anyio
+    async def test_participants_integrity_across_activities(self, async_client, unique_email):
+        """Test concurrent signups to several activities are all reflected"""
+        email = unique_email("integrity-test")
+        names = ["Basketball", "Drama Club", "Gym Class"]
 
+        # Reads and writes on different activities are independent, so each
+        # phase is dispatched concurrently; only the phases themselves are serial
+        before = await asyncio.gather(*[
+            async_client.get(f"/activities/{name}/participants") for name in names
+        ])
+        signups = await asyncio.gather(*[
+            async_client.post(f"/activities/{name}/signup", params={"email": email})
+            for name in names
+        ])
+        assert [r.status_code for r in signups] == [200] * len(names)
+        after = await asyncio.gather(*[
+            async_client.get(f"/activities/{name}/participants") for name in names
+        ])
 
+        for initial, current in zip(before, after):
+            assert current.json()["count"] == initial.json()["count"] + 1
+            assert email in current.json()["participants"]
+
+    def test_batch_reports_errors_per_operation(self, client, unique_email):
+        """Test that a failing batch operation does not abort the rest"""
+        email = unique_email("test")
+        response = client.post("/activities/batch", json=[
+            {"op": "signup", "activity": "Fake Activity", "email": email},
+            {"op": "signup", "activity": "Basketball", "email": email},
+        ])
+        assert response.status_code == 200
+
+        missing, signup = response.json()
+        assert missing["status_code"] == 404
+        assert missing["body"]["detail"]["code"] == "ACTIVITY_NOT_FOUND"
+        assert signup["status_code"] == 200
+
+
+@pytest.mark.xdist_group("email")
 class TestEmailValidation:
     """Test cases for email validation"""
 
-    def test_signup_with_invalid_email_no_at_symbol(self):
-        """Test signup fails with email missing @ symbol"""
+    @pytest.mark.parametrize("bad_email", MALFORMED_EMAILS)
+    def test_signup_rejects_bad_email(self, client, bad_email):
+        """Test signup fails with malformed emails (no @, no domain, no extension, empty, spaces)"""
         response = client.post(
-            "/activities/Basketball/signup?email=testmergington.edu"
+            "/activities/Basketball/signup", params={"email": bad_email}
         )
         assert response.status_code == 400
-        assert "Invalid email format" in response.json()["detail"]
+        assert response.json()["detail"]["code"] == "INVALID_EMAIL"
 
-    def test_signup_with_invalid_email_no_domain(self):
-        """Test signup fails with email missing domain"""
+    @pytest.mark.parametrize("email", VALID_EMAILS)
+    def test_signup_with_valid_email_variations(self, client, email):
+        """Test signup succeeds with various valid email formats (mergington.edu domain)"""
         response = client.post(
-            "/activities/Basketball/signup?email=test@"
+            "/activities/Chess Club/signup", params={"email": email}
         )
-        assert response.status_code == 400
-        assert "Invalid email format" in response.json()["detail"]
+        assert response.status_code == 200
 
-    def test_signup_with_invalid_email_no_extension(self):
-        """Test signup fails with email missing extension"""
-        response = client.post(
-            "/activities/Basketball/signup?email=test@mergington"
-        )
-        assert response.status_code == 400
-        assert "Invalid email format" in response.json()["detail"]
+    @pytest.mark.anyio
+    async def test_concurrent_signups_with_valid_emails(self, async_client):
+        """Test concurrent signups with every valid email format all succeed"""
+        responses = await asyncio.gather(*[
+            async_client.post("/activities/Chess Club/signup", params={"email": email})
+            for email in VALID_EMAILS
+        ])
+        assert [r.status_code for r in responses] == [200] * len(VALID_EMAILS)
 
-    def test_signup_with_empty_email(self):
-        """Test signup fails with empty email"""
-        response = client.post(
-            "/activities/Basketball/signup?email="
-        )
-        assert response.status_code == 400
-        assert "Invalid email format" in response.json()["detail"]
+        activities = (await async_client.get("/activities")).json()
+        for email in VALID_EMAILS:
+            assert email in activities["Chess Club"]["participants"]
 
-    def test_signup_with_email_with_spaces(self):
-        """Test signup fails with email containing spaces"""
+    @pytest.mark.anyio
+    async def test_concurrent_signups_with_wrong_domain(self, async_client):
+        """Test concurrent signups with non-mergington.edu domains all fail"""
+        responses = await asyncio.gather(*[
+            async_client.post("/activities/Basketball/signup", params={"email": email})
+            for email in INVALID_DOMAIN_EMAILS
+        ])
+        assert [r.status_code for r in responses] == [400] * len(INVALID_DOMAIN_EMAILS)
+
+    @pytest.mark.parametrize("email", INVALID_DOMAIN_EMAILS)
+    def test_signup_with_wrong_domain(self, client, email):
+        """Test signup fails with non-mergington.edu domain"""
         response = client.post(
-            "/activities/Basketball/signup?email=test user@mergington.edu"
+            "/activities/Basketball/signup", params={"email": email}
         )
         assert response.status_code == 400
-        assert "Invalid email format" in response.json()["detail"]
-
-    def test_signup_with_valid_email_variations(self):
-        """Test signup succeeds with various valid email formats (mergington.edu domain)"""
-        valid_emails = [
-            "simple@mergington.edu",
-            "user.name@mergington.edu",
-            "user_name@mergington.edu",
-            "user123@mergington.edu"
-        ]
-        
-        for email in valid_emails:
-            response = client.post(
-                f"/activities/Chess Club/signup?email={email}"
-            )
-            # Email validation should pass (activity might be full, but email format is valid)
-            assert response.status_code in [200, 400]
-            if response.status_code == 400:
-                # If error, should be about activity, not email format
-                assert "Invalid email format" not in response.json()["detail"]
-
-    def test_signup_with_wrong_domain(self):
-        """Test signup fails with non-mergington.edu domain"""
-        invalid_domain_emails = [
-            "user@example.com",
-            "user@gmail.com",
-            "user@mergington.com",
-            "user@mergington.org"
-        ]
-        
-        for email in invalid_domain_emails:
-            response = client.post(
-                f"/activities/Basketball/signup?email={email}"
-            )
-            assert response.status_code == 400
-            assert "Invalid email format" in response.json()["detail"]
+        assert response.json()["detail"]["code"] == "INVALID_EMAIL"